@@ -25,9 +25,8 @@
 from __future__ import annotations
 
 import contextlib
-import fnmatch
 import sys
-from typing import TYPE_CHECKING, Generator
+from typing import TYPE_CHECKING, Generator, Iterable
 
 import apt_pkg
 from apt.cache import Cache as _Cache
@@ -37,7 +36,7 @@ from nala import _, color, color_version
 from nala.constants import ERROR_PREFIX, NOTICE_PREFIX, WARNING_PREFIX
 from nala.options import arguments
 from nala.rich import Columns, from_ansi
-from nala.utils import dprint, eprint, term
+from nala.utils import compile_glob, dprint, eprint, term
 
 if TYPE_CHECKING:
 	from nala.debfile import NalaDebPackage
@@ -111,6 +110,12 @@ class Cache(_Cache):
 		else:
 			return not pkg.has_versions
 
+	def resolve_names(
+		self, pkg_names: list[str], show: bool = False, remove: bool = False
+	) -> list[str]:
+		"""Glob and then resolve virtual packages in the provided names."""
+		return self.virtual_filter(self.glob_filter(pkg_names, show), remove)
+
 	def glob_filter(self, pkg_names: list[str], show: bool = False) -> list[str]:
 		"""Filter provided packages and glob *.
 
@@ -121,13 +126,24 @@ class Cache(_Cache):
 		if "*" not in f"{pkg_names}":
 			return pkg_names
 
+		# Match every glob in a single pass over the package names
+		globs = {
+			pkg_name: compile_glob(pkg_name).match
+			for pkg_name in pkg_names
+			if "*" in pkg_name
+		}
+		matches: dict[str, list[str]] = {pkg_name: [] for pkg_name in globs}
+		for name in self.get_pkg_names(show):
+			for pkg_name, glob in globs.items():
+				if glob(name):
+					matches[pkg_name].append(name)
+
 		new_packages: list[str] = []
 		glob_failed = False
 		for pkg_name in pkg_names:
-			if "*" in pkg_name:
+			if pkg_name in globs:
 				dprint(f"Globbing: {pkg_name}")
-				glob = fnmatch.filter(self.get_pkg_names(show), pkg_name)
-				if not glob:
+				if not matches[pkg_name]:
 					glob_failed = True
 					eprint(
 						_(
@@ -135,7 +151,7 @@ class Cache(_Cache):
 						).format(error=ERROR_PREFIX, pkg=color(pkg_name, "YELLOW"))
 					)
 					continue
-				new_packages.extend(glob)
+				new_packages.extend(matches[pkg_name])
 			else:
 				new_packages.append(pkg_name)
 
@@ -241,6 +257,23 @@ class Cache(_Cache):
 					protected.add(pkg)
 		return protected
 
+	def kept_back_pkgs(
+		self, is_upgrade: Iterable[Package], protected: set[Package]
+	) -> tuple[Package, ...]:
+		"""Return the upgradable packages that weren't marked for upgrade or removal."""
+		depcache = self._depcache
+		kept_back = tuple(
+			pkg
+			for pkg in is_upgrade
+			if not (
+				depcache.marked_upgrade(pkg._pkg)
+				or depcache.marked_delete(pkg._pkg)
+				or pkg in protected
+			)
+		)
+		dprint(f"Kept Back: {[pkg.name for pkg in kept_back]}")
+		return kept_back
+
 	def upgradable_pkgs(self) -> Generator[Package, None, None]:
 		"""Generate upgradable packages."""
 		return (pkg for pkg in self if pkg.is_upgradable)
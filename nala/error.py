@@ -509,7 +509,7 @@ class BrokenError:
 	def unmarked_error(pkgs: list[Package]) -> None:
 		"""Print error messages related to the fixer unmarking packages requested for install."""
 		for pkg in pkgs:
-			if not pkg.marked_upgrade or pkg.marked_install:
+			if not (pkg.marked_upgrade or pkg.marked_install or pkg.marked_downgrade):
 				print(
 					_("{package} has been unmarked.").format(
 						package=color(pkg.name, "GREEN"),
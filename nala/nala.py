@@ -28,7 +28,7 @@ from __future__ import annotations
 import re
 import sys
 from subprocess import run
-from typing import Generator, Optional, Pattern
+from typing import Generator, Optional
 
 import apt_pkg
 import typer
@@ -93,13 +93,12 @@ from nala.options import (
 	nala,
 )
 from nala.rich import ELLIPSIS
-from nala.search import iter_search, list_match, search_name
+from nala.search import compile_match, iter_search, search_name
 from nala.show import additional_notice, pkg_not_found, show_main
 from nala.utils import (
 	PackageHandler,
 	ask,
 	command_help,
-	compile_regex,
 	dedupe_list,
 	eprint,
 	get_version,
@@ -135,8 +134,7 @@ def _remove(pkg_names: list[str]) -> None:
 	cache = setup_cache()
 	check_state(cache, nala_pkgs)
 
-	pkg_names = cache.glob_filter(dedupe_list(pkg_names))
-	pkg_names = cache.virtual_filter(pkg_names, remove=True)
+	pkg_names = cache.resolve_names(dedupe_list(pkg_names), remove=True)
 	broken, not_found, ver_failed = check_broken(
 		pkg_names,
 		cache,
@@ -172,8 +170,7 @@ def _install(pkg_names: list[str] | None, ctx: typer.Context) -> None:
 	not_exist = split_local(pkg_names, cache, nala_pkgs.local_debs)
 	install_local(nala_pkgs, cache)
 
-	pkg_names = cache.glob_filter(pkg_names)
-	pkg_names = cache.virtual_filter(pkg_names)
+	pkg_names = cache.resolve_names(pkg_names)
 	broken, not_found, ver_failed = check_broken(pkg_names, cache)
 	not_found.extend(not_exist)
 
@@ -189,6 +186,34 @@ def _install(pkg_names: list[str] | None, ctx: typer.Context) -> None:
 	get_changes(cache, nala_pkgs, "install")
 
 
+def _filter_packages(
+	cache: Cache,
+	user_installed: set[str] | None = None,
+	arches: frozenset[str] | None = None,
+) -> Generator[Package, None, None]:
+	"""Generate the packages in the cache that pass the filter options.
+
+	user_installed and arches are not filtered on when they are None.
+	"""
+	installed = arguments.installed
+	upgradable = arguments.upgradable
+	virtual = arguments.virtual
+	# The checks are ordered from cheapest to most expensive,
+	# so the calls into the depcache only happen for the packages left.
+	for pkg in cache:
+		if arches is not None and pkg._pkg.architecture not in arches:
+			continue
+		if user_installed is not None and pkg.name not in user_installed:
+			continue
+		if installed and not pkg.is_installed:
+			continue
+		if upgradable and not pkg.is_upgradable:
+			continue
+		if virtual and not cache.is_virtual_package(pkg.name):
+			continue
+		yield pkg
+
+
 def remove_completion(ctx: typer.Context) -> Generator[str, None, None]:
 	"""Complete remove command arguments."""
 	if not DPKG_STATE.exists():
@@ -269,12 +294,16 @@ def upgrade(
 		full: bool = True,
 		exclude: list[str] | None = None,
 		nested_cache: Cache | None = None,
+		is_upgrade: tuple[Package, ...] | None = None,
 	) -> None:
 		"""Upgrade pkg[s]."""
 		cache = nested_cache or setup_cache()
 		check_state(cache, nala_pkgs)
 
-		is_upgrade = tuple(cache.upgradable_pkgs())
+		# Clearing the cache doesn't change what can be upgraded,
+		# so a retry can reuse the packages we found the first time
+		if is_upgrade is None:
+			is_upgrade = tuple(cache.upgradable_pkgs())
 		protected = cache.protect_upgrade_pkgs(exclude)
 		try:
 			cache.upgrade(dist_upgrade=full)
@@ -283,7 +312,7 @@ def upgrade(
 				exclude = fix_excluded(protected, is_upgrade)
 				if ask(_("Would you like us to protect these and try again?")):
 					cache.clear()
-					_upgrade(full, exclude, cache)
+					_upgrade(full, exclude, cache, is_upgrade)
 					sys.exit()
 				sys.exit(
 					_("{error} You have held broken packages").format(
@@ -295,11 +324,7 @@ def upgrade(
 				cache, tuple(pkg for pkg in cache if pkg.is_inst_broken)
 			).broken_install()
 
-		if kept_back := tuple(
-			pkg
-			for pkg in is_upgrade
-			if not (pkg.marked_upgrade or pkg.marked_delete or pkg in protected)
-		):
+		if kept_back := cache.kept_back_pkgs(is_upgrade, protected):
 			BrokenError(cache, kept_back).held_pkgs(protected)
 			check_term_ask()
 
@@ -421,16 +446,16 @@ def show(
 	command_help("info", "show", None)
 	cache = Cache()
 	not_found: list[str] = []
-	pkg_names = cache.glob_filter(pkg_names, show=True)
-	pkg_names = cache.virtual_filter(pkg_names)
-	additional_records = 0
-	for num, pkg_name in enumerate(pkg_names):
+	pkg_names = cache.resolve_names(pkg_names, show=True)
+	pkgs: list[Package] = []
+	for pkg_name in pkg_names:
 		if pkg_name in cache:
-			pkg = cache[pkg_name]
-			additional_records += show_main(num, pkg)
+			pkgs.append(cache[pkg_name])
 			continue
 		pkg_not_found(pkg_name, cache, not_found)
 
+	additional_records = sum(show_main(num, pkg) for num, pkg in enumerate(pkgs))
+
 	if additional_records and not arguments.all_versions:
 		additional_notice(additional_records)
 
@@ -465,30 +490,17 @@ def search(
 	cache = Cache()
 	found: list[tuple[Package, Version]] = []
 	user_installed = (
-		get_list(get_history("Nala"), "User-Installed") if nala_installed else []
+		set(get_list(get_history("Nala"), "User-Installed"))
+		if nala_installed
+		else None
 	)
 
-	search_pattern: tuple[str, Pattern[str] | None]
-	if word.startswith("g/"):
-		search_pattern = (word, None)
-	elif word.startswith("r/"):
-		search_pattern = (word, compile_regex(word[2:]))
-	else:
-		search_pattern = (word, compile_regex(word))
+	match = compile_match(word)
 
-	arches = apt_pkg.get_architectures()
+	arches = None if arguments.all_arches else frozenset(apt_pkg.get_architectures())
 
-	for pkg in cache:
-		if nala_installed and pkg.name not in user_installed:
-			continue
-		if arguments.installed and not pkg.installed:
-			continue
-		if arguments.upgradable and not pkg.is_upgradable:
-			continue
-		if arguments.virtual and not cache.is_virtual_package(pkg.name):
-			continue
-		if arguments.all_arches or pkg.architecture() in arches:
-			found.extend(search_name(pkg, search_pattern))
+	for pkg in _filter_packages(cache, user_installed, arches):
+		found.extend(search_name(pkg, match))
 
 	if not found:
 		sys.exit(_("{error} {regex} not found.").format(error=ERROR_PREFIX, regex=word))
@@ -517,41 +529,23 @@ def list_pkgs(
 	"""List packages based on package names."""
 	cache = Cache()
 	user_installed = (
-		get_list(get_history("Nala"), "User-Installed") if nala_installed else []
+		set(get_list(get_history("Nala"), "User-Installed"))
+		if nala_installed
+		else None
 	)
 
-	patterns: dict[str, Pattern[str] | None] = {}
-	if pkg_names:
-		for name in pkg_names:
-			if name.startswith("r/"):
-				# Take out the prefix when we compile the regex
-				patterns[name] = compile_regex(name[2:])
-				continue
-			if name.startswith("g/"):
-				# We won't be using regex here.
-				patterns[name] = None
-				continue
-			# Otherwise we can just compile it
-			patterns[name] = compile_regex(name)
+	patterns = [compile_match(name) for name in pkg_names or ()]
 
 	def _list_gen() -> Generator[
 		tuple[Package, Version | tuple[Version, ...]], None, None
 	]:
 		"""Generate to speed things up."""
-		for pkg in cache:
-			if nala_installed and pkg.name not in user_installed:
-				continue
-			if arguments.installed and not pkg.installed:
-				continue
-			if arguments.upgradable and not pkg.is_upgradable:
-				continue
-			if arguments.virtual and not cache.is_virtual_package(pkg.name):
-				continue
+		for pkg in _filter_packages(cache, user_installed):
 			if pkg_names:
-				for name, regex in patterns.items():
-					if list_match(pkg.fullname, name, regex):
-						yield (pkg, get_version(pkg, inst_first=True))
-						continue
+				# Only get the fullname once, not for every pattern
+				fullname = pkg.fullname
+				if any(match(fullname) for match in patterns):
+					yield (pkg, get_version(pkg, inst_first=True))
 				# If names were supplied and no matches
 				# we don't want to grab everything
 				continue
@@ -575,17 +569,14 @@ def clean(
 	"""Clear out the local archive of downloaded package files."""
 	sudo_check()
 	if lists:
-		iter_remove(LISTS_DIR)
-		iter_remove(LISTS_PARTIAL_DIR)
+		iter_remove(LISTS_DIR, LISTS_PARTIAL_DIR)
 		print(_("Package lists have been cleaned"))
 		return
 	if fetch:
 		NALA_SOURCES.unlink(missing_ok=True)
 		print(_("Nala sources.list has been cleaned"))
 		return
-	iter_remove(ARCHIVE_DIR)
-	iter_remove(PARTIAL_DIR)
-	iter_remove(LISTS_PARTIAL_DIR)
+	iter_remove(ARCHIVE_DIR, PARTIAL_DIR, LISTS_PARTIAL_DIR)
 	vprint(
 		_("Removing {cache}\nRemoving {src_cache}").format(
 			cache=PKGCACHE, src_cache=SRCPKGCACHE
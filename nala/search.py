@@ -24,82 +24,125 @@
 """Functions for the Nala Search command."""
 from __future__ import annotations
 
-from fnmatch import fnmatch
-from typing import Generator, Iterable, Pattern, cast
+import sys
+from typing import Callable, Generator, Iterable, cast
 
 from apt.package import Package, Version
 
 from nala import COLOR_CODES, _, color
 from nala.options import arguments
 from nala.rich import ascii_replace, is_utf8
-from nala.utils import get_version, pkg_candidate, pkg_installed
+from nala.utils import (
+	compile_glob,
+	compile_regex,
+	get_version,
+	pkg_candidate,
+	pkg_installed,
+)
 
 TOP_LINE = "├──" if is_utf8 else "+--"
 BOT_LINE = "└──" if is_utf8 else "`--"
 LINE = "│   " if is_utf8 else "|   "
+# Characters that mean a search pattern has to go through regex
+REGEX_SPECIAL = frozenset("\\.^$*+?{}[]|()")
+# Number of search results that are written to the terminal at once
+SEARCH_BATCH = 100
 
 
 def search_name(
 	pkg: Package,
-	pattern: tuple[str, Pattern[str] | None],
+	match: Callable[[str], bool],
 ) -> Generator[tuple[Package, Version], None, None]:
 	"""Search the package name and description."""
-	searches = [pkg.fullname]
-	if not arguments.names:
-		records = pkg._pcache._records
-		records.lookup(pkg._pkg.version_list[0].file_list[0])
-		searches.extend([records.long_desc, records.source_pkg])
-
-	for string in searches:
-		word, regex = pattern
-		if not list_match(string, word, regex):
-			continue
-
-		# Must have found a match, Hurray!
-		if isinstance(version := get_version(pkg, inst_first=True), tuple):
-			yield from ((pkg, ver) for ver in version)
-			return
-		yield (pkg, version)
-
-
-def list_match(search: str, name: str, regex: Pattern[str] | None) -> bool:
-	"""Glob or Regex match the given name to the package name."""
-	# Name starts with g/ only attempt a glob
-	if name.startswith("g/") and fnmatch(search, name[2:]):
-		return True
+	if not any(match(string) for string in _search_strings(pkg)):
+		return
+
+	# Must have found a match, Hurray!
+	if isinstance(version := get_version(pkg, inst_first=True), tuple):
+		yield from ((pkg, ver) for ver in version)
+		return
+	yield (pkg, version)
+
+
+def _search_strings(pkg: Package) -> Generator[str, None, None]:
+	"""Generate the strings of a package to match against.
 
-	# If we don't have a regex return None
-	if not regex:
-		return False
+	The package records are only looked up if the name didn't match,
+	as the lookup is much more expensive than the match itself.
+	"""
+	yield pkg.fullname
+	if arguments.names:
+		return
+	records = pkg._pcache._records
+	records.lookup(pkg._pkg.version_list[0].file_list[0])
+	yield records.long_desc
+	yield records.source_pkg
+
+
+def compile_match(name: str) -> Callable[[str], bool]:
+	"""Return a function that will Glob or Regex match strings to the given name.
+
+	The glob and regex are compiled and the prefix checked once here,
+	instead of for every package that we match against.
+	"""
+	# Name starts with g/ only attempt a glob
+	if name.startswith("g/"):
+		glob = compile_glob(name[2:]).match
+		return lambda string: glob(string) is not None
 
 	if name.startswith("r/"):
 		# Name starts with r/ only attempt a regex
-		return bool(regex.search(search))
+		if is_literal(name[2:]):
+			return literal_match(name[2:])
+		search = compile_regex(name[2:]).search
+		return lambda string: search(string) is not None
+
+	# A lone * globs everything so there is nothing to match
+	if name == "*":
+		return lambda string: True
+
+	# A plain word can only glob itself, which the regex would find anyway
+	if is_literal(name):
+		return literal_match(name)
 
 	# Otherwise try to glob first then regex and return the result
-	return bool(fnmatch(search, name) or regex.search(search))
+	glob = compile_glob(name).match
+	search = compile_regex(name).search
+	return lambda string: glob(string) is not None or search(string) is not None
+
+
+def is_literal(pattern: str) -> bool:
+	"""Return True if the pattern has no special regex or glob characters."""
+	return REGEX_SPECIAL.isdisjoint(pattern)
+
+
+def literal_match(word: str) -> Callable[[str], bool]:
+	"""Return a function that will case insensitively find the word in strings."""
+	word = word.lower()
+	return lambda string: word in string.lower()
 
 
 def iter_search(found: Iterable[tuple[Package, Version | tuple[Version, ...]]]) -> bool:
 	"""Iterate the search results."""
-	pkg_list_check: list[Package] = []
-	for item in found:
-		pkg, version = item
-		if isinstance(version, tuple):
-			for ver in version:
-				print_search(pkg, ver, pkg_list_check)
-		else:
-			print_search(pkg, version, pkg_list_check)
-
-	if not pkg_list_check:
-		return False
-	return True
-
-
-def print_search(pkg: Package, version: Version, pkg_list_check: list[Package]) -> None:
-	"""Print the search results to the terminal."""
-	pkg_list_check.append(pkg)
-	print(
+	found_pkgs = False
+	batch: list[str] = []
+	for pkg, version in found:
+		for ver in version if isinstance(version, tuple) else (version,):
+			batch.append(format_search(pkg, ver))
+		if len(batch) >= SEARCH_BATCH:
+			found_pkgs = True
+			sys.stdout.write("".join(batch))
+			batch.clear()
+
+	if batch:
+		found_pkgs = True
+		sys.stdout.write("".join(batch))
+	return found_pkgs
+
+
+def format_search(pkg: Package, version: Version) -> str:
+	"""Return the formatted search result for the terminal."""
+	return (
 		ascii_replace(
 			set_search_description(
 				set_search_installed(
@@ -112,8 +155,8 @@ def print_search(pkg: Package, version: Version, pkg_list_check: list[Package])
 				),
 				version,
 			)
-		),
-		end="\n\n",
+		)
+		+ "\n\n"
 	)
 
 
@@ -25,6 +25,7 @@
 from __future__ import annotations
 
 import re
+import sys
 from pathlib import Path
 from random import shuffle
 from typing import cast
@@ -47,27 +48,30 @@ URL_PATTERN = re.compile(r"(https?://.*?/.*?/)")
 
 def show_main(num: int, pkg: Package) -> int:
 	"""Orchestrate show command with support for all_versions."""
-	if num:
-		print(f"\n{'='*term.columns}\n")
+	separator = f"\n{'='*term.columns}\n\n"
+	output: list[str] = [separator] if num else []
 	count = len(pkg.versions)
 	versions = pkg.versions if arguments.all_versions else [pkg.candidate]
 	for ver_num, ver in enumerate(versions):
 		if ver is None:
-			print(
+			output.append(
 				_("{pkg_name} has no candidate").format(
 					pkg_name=color(pkg.name, "YELLOW")
 				)
+				+ "\n"
 			)
 			continue
 		if ver_num and not num:
-			print(f"\n{'='*term.columns}\n")
+			output.append(separator)
 		count -= 1
-		show_pkg(ver)
+		output.append(f"{format_pkg(ver)}\n")
+	# Write the whole package at once instead of a print for each section
+	sys.stdout.write("".join(output))
 	return count
 
 
-def show_pkg(candidate: Version) -> None:
-	"""Start show functions."""
+def format_pkg(candidate: Version) -> str:
+	"""Return the formatted show output of the version."""
 	pkg = candidate.package
 	msg = f"{show_format(pkg, candidate)}\n{show_related(candidate)}"
 	if candidate.homepage:
@@ -84,7 +88,7 @@ def show_pkg(candidate: Version) -> None:
 			header=color(_("Description:")),
 			info=ascii_replace(candidate._translated_records.long_desc),
 		)
-	print(msg.strip())
+	return msg.strip()
 
 
 def show_related(candidate: Version) -> str:
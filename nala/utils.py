@@ -27,6 +27,7 @@
 from __future__ import annotations
 
 import contextlib
+import fnmatch
 import os
 import re
 import signal
@@ -36,6 +37,7 @@ import tty
 from dataclasses import dataclass, field
 from datetime import datetime
 from fcntl import LOCK_EX, LOCK_NB, lockf
+from functools import lru_cache
 from pathlib import Path
 from types import FrameType
 from typing import TYPE_CHECKING, Any, Generator, Iterable, Pattern
@@ -341,6 +343,12 @@ def compile_regex(regex: str) -> Pattern[str]:
 		)
 
 
+@lru_cache(maxsize=256)
+def compile_glob(pattern: str) -> Pattern[str]:
+	"""Translate and compile the glob, only once per pattern."""
+	return re.compile(fnmatch.translate(pattern))
+
+
 def sudo_check(args: Iterable[str] | None = None) -> None:
 	"""Check for root and exit if not root."""
 	if not term.is_su():
@@ -408,13 +416,17 @@ def unit_str(val: int) -> str:
 	return f"{val :.0f} {size[0]}"
 
 
-def iter_remove(path: Path) -> None:
-	"""Iterate the directory supplied and remove all files."""
-	vprint(_("Removing files in {dir}").format(dir=path))
-	for file in path.iterdir():
-		if file.is_file():
-			vprint(_("Removed: {filename}").format(filename=file))
-			file.unlink(missing_ok=True)
+def iter_remove(*paths: Path) -> None:
+	"""Iterate the directories supplied and remove all files."""
+	for path in paths:
+		vprint(_("Removing files in {dir}").format(dir=path))
+		# scandir gives us the file type from the directory entry without a stat
+		with os.scandir(path) as entries:
+			for entry in entries:
+				if entry.is_file():
+					vprint(_("Removed: {filename}").format(filename=entry.path))
+					with contextlib.suppress(FileNotFoundError):
+						os.unlink(entry.path)
 
 
 def get_version(
@@ -484,11 +496,8 @@ def dedupe_list(original: Iterable[str]) -> list[str]:
 
 	Useful for when we want to maintain the list order and can't use set()
 	"""
-	dedupe = []
-	for item in original:
-		if item not in dedupe:
-			dedupe.append(item)
-	return dedupe
+	# Dicts keep insertion order, so this dedupes without searching the list
+	return list(dict.fromkeys(original))
 
 
 def vprint(msg: object) -> None: